@@ -17,3 +17,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "terminal_backend.settings")
 
 application = get_asgi_application()
+
+# Only serving processes import this module: warm the default Whisper model.
+from voice_transcription.transcription_service import preload_default_model  # noqa: E402
+
+preload_default_model()
@@ -0,0 +1,40 @@
+"""
+orjson-backed DRF renderer, registered project-wide in settings.REST_FRAMEWORK.
+
+Stand-in for rest_framework.renderers.JSONRenderer: the same compact UTF-8
+output, but encoded by orjson's C implementation. Types orjson doesn't know
+natively (Decimal, lazy translation strings, ...) go through DRF's own
+JSONEncoder. Aware UTC datetimes end in 'Z', and U+2028/U+2029 are escaped,
+both matching JSONRenderer.
+
+Anything orjson refuses outright (integers wider than 64 bits) is rendered by
+JSONRenderer itself, and so are requests asking for an indented response.
+One difference remains: NaN and Infinity render as null, where JSONRenderer
+raises ValueError.
+"""
+
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_fallback_default = JSONEncoder().default
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+class ORJSONRenderer(BaseRenderer):
+    media_type = "application/json"
+    format = "json"
+    charset = None  # orjson always emits UTF-8; no charset param, like JSONRenderer
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        json_renderer = JSONRenderer()
+        if json_renderer.get_indent(accepted_media_type, renderer_context or {}):
+            return json_renderer.render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=_fallback_default, option=_OPTIONS)
+        except orjson.JSONEncodeError:
+            return json_renderer.render(data, accepted_media_type, renderer_context)
+        # Valid JSON but not valid JavaScript unescaped; JSONRenderer escapes them.
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
@@ -92,11 +92,24 @@ ASGI_APPLICATION = "terminal_backend.asgi.application"
 # Defaults to the bundled sqlite file so the non-docker venv flow keeps working
 # unchanged. When DATABASE_URL or the discrete POSTGRES_* env vars are present
 # (as set by docker-compose), Postgres is used instead.
+#
+# Connections are closed after each request by default. The Dockerfile serves
+# the app with daphne (ASGI), where every request's sync view runs on a fresh
+# per-request thread, so a per-thread persistent connection is never picked up
+# again (Django ticket #33497). Set DB_CONN_MAX_AGE (seconds) only when serving
+# through a WSGI server with long-lived worker threads.
+#
+# When scaled out behind an external pooler (PgBouncer in transaction mode),
+# set DB_POOLER=pgbouncer: the pooler owns connection reuse, and Django stops
+# using server-side cursors, which don't survive transaction pooling.
+_POOLER = os.environ.get("DB_POOLER", "").lower()
+_CONN_MAX_AGE = int(os.environ.get("DB_CONN_MAX_AGE", "0"))
 
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        "CONN_MAX_AGE": _CONN_MAX_AGE,
     }
 }
 
@@ -105,7 +118,7 @@ if _DATABASE_URL:
     import dj_database_url
 
     DATABASES["default"] = dj_database_url.parse(
-        _DATABASE_URL, conn_max_age=600
+        _DATABASE_URL, conn_max_age=_CONN_MAX_AGE
     )
 elif os.environ.get("POSTGRES_DB"):
     DATABASES["default"] = {
@@ -115,9 +128,12 @@ elif os.environ.get("POSTGRES_DB"):
         "PASSWORD": os.environ.get("POSTGRES_PASSWORD", ""),
         "HOST": os.environ.get("POSTGRES_HOST", "db"),
         "PORT": os.environ.get("POSTGRES_PORT", "5432"),
-        "CONN_MAX_AGE": 600,
+        "CONN_MAX_AGE": _CONN_MAX_AGE,
     }
 
+if _POOLER == "pgbouncer":
+    DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = True
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -196,7 +212,7 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'terminal_backend.renderers.ORJSONRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
@@ -212,3 +228,12 @@ os.environ.setdefault('DJANGO_ALLOW_ASYNC_UNSAFE', 'true')
 # Media files configuration for voice recordings
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# Whisper model used when a transcription request doesn't name one. It is also
+# loaded at server start (see voice_transcription.transcription_service
+# .preload_default_model), so the first transcription doesn't pay the load.
+WHISPER_DEFAULT_MODEL = os.environ.get('WHISPER_DEFAULT_MODEL', 'base')
+WHISPER_PRELOAD = os.environ.get('WHISPER_PRELOAD', 'true').lower() == 'true'
+# CTranslate2 compute type override (e.g. 'float16', 'float32'); empty picks
+# int8_float16 on CUDA and int8 on CPU.
+WHISPER_COMPUTE_TYPE = os.environ.get('WHISPER_COMPUTE_TYPE', '')
@@ -0,0 +1,58 @@
+import datetime
+import decimal
+import uuid
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+from .renderers import ORJSONRenderer
+
+
+class ORJSONRendererParityTests(SimpleTestCase):
+    """ORJSONRenderer must produce exactly what DRF's JSONRenderer does."""
+
+    def assertSameOutput(self, data, accepted_media_type=None):
+        self.assertEqual(
+            ORJSONRenderer().render(data, accepted_media_type),
+            JSONRenderer().render(data, accepted_media_type),
+        )
+
+    def test_plain_values(self):
+        self.assertSameOutput({
+            "id": 7, "ratio": 0.25, "ok": True, "none": None,
+            "items": [1, "two", {"three": 3}], "text": "héllo ✓",
+        })
+
+    def test_none_renders_empty(self):
+        self.assertEqual(ORJSONRenderer().render(None), b"")
+
+    def test_datetimes(self):
+        self.assertSameOutput({
+            "utc": datetime.datetime(2024, 1, 2, 3, 4, 5, 123456, tzinfo=datetime.timezone.utc),
+            "offset": datetime.datetime(
+                2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone(datetime.timedelta(hours=2))
+            ),
+            "naive": datetime.datetime(2024, 1, 2, 3, 4, 5),
+            "date": datetime.date(2024, 1, 2),
+        })
+
+    def test_fallback_types(self):
+        self.assertSameOutput({
+            "decimal": decimal.Decimal("1.5"),
+            "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "lazy": gettext_lazy("hello"),
+            "delta": datetime.timedelta(seconds=90),
+        })
+
+    def test_non_str_keys(self):
+        self.assertSameOutput({1: "a", 2: "b"})
+
+    def test_line_separators_escaped(self):
+        self.assertSameOutput({"text": "a\u2028b\u2029c"})
+
+    def test_big_int(self):
+        self.assertSameOutput({"n": 2 ** 70})
+
+    def test_indent(self):
+        self.assertSameOutput({"a": [1, 2]}, "application/json; indent=4")
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "terminal_backend.settings")
 
 application = get_wsgi_application()
+
+# Only serving processes import this module: warm the default Whisper model.
+from voice_transcription.transcription_service import preload_default_model  # noqa: E402
+
+preload_default_model()
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-15 22:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voice_transcription', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='voicetranscription',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+    ]
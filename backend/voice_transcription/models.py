@@ -10,7 +10,7 @@ class VoiceTranscription(models.Model):
     confidence_score = models.FloatField(null=True, blank=True)
     model_used = models.CharField(max_length=100, default='whisper-base')
     processing_time = models.FloatField(help_text="Processing time in seconds")
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     
     class Meta:
         ordering = ['-created_at']
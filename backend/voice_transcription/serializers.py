@@ -1,3 +1,4 @@
+from django.conf import settings
 from rest_framework import serializers
 from .models import VoiceTranscription
 
@@ -20,7 +21,7 @@ class AudioUploadSerializer(serializers.Serializer):
             ('small', 'Whisper Small (better accuracy)'),
             ('medium', 'Whisper Medium (high accuracy, slower)'),
         ],
-        default='base'
+        default=settings.WHISPER_DEFAULT_MODEL
     )
     # Default to None so Whisper auto-detects the language. A specific code
     # (e.g. 'en') is only used when the caller explicitly passes one.
@@ -0,0 +1,196 @@
+"""
+Tests for voice transcription housekeeping and the Whisper service caches
+"""
+
+import io
+import tempfile
+from datetime import timedelta
+from types import SimpleNamespace
+
+import numpy as np
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.utils import timezone
+from unittest.mock import patch
+
+from . import transcription_service as transcription_service_module
+from . import views
+from .models import VoiceTranscription
+from .serializers import AudioUploadSerializer
+from .transcription_service import WhisperTranscriptionService
+
+
+def _create_rows(count, created_at=None):
+    """Create count rows, one second apart (oldest first) unless created_at is given."""
+    now = timezone.now()
+    rows = [
+        VoiceTranscription.objects.create(
+            audio_filename=f'clip-{i}.wav',
+            transcription_text=f'text {i}',
+            processing_time=0.1,
+        )
+        for i in range(count)
+    ]
+    for i, row in enumerate(rows):
+        stamp = created_at or now - timedelta(seconds=count - i)
+        VoiceTranscription.objects.filter(pk=row.pk).update(created_at=stamp)
+    return rows
+
+
+class PruneTranscriptionsTestCase(TestCase):
+    """Test _prune_transcriptions keeps exactly the newest rows"""
+
+    def test_under_cap_deletes_nothing(self):
+        """Test rows under the cap are left alone"""
+        _create_rows(3)
+        with patch.object(views, 'MAX_TRANSCRIPTION_ROWS', 5):
+            views._prune_transcriptions()
+        self.assertEqual(VoiceTranscription.objects.count(), 3)
+
+    def test_keeps_newest_rows(self):
+        """Test the oldest rows beyond the cap are deleted"""
+        rows = _create_rows(5)
+        with patch.object(views, 'MAX_TRANSCRIPTION_ROWS', 3):
+            views._prune_transcriptions()
+        kept = set(VoiceTranscription.objects.values_list('audio_filename', flat=True))
+        self.assertEqual(kept, {row.audio_filename for row in rows[2:]})
+
+    def test_equal_timestamps_keep_cap(self):
+        """Test rows sharing the cutoff timestamp still leave exactly the cap"""
+        _create_rows(5, created_at=timezone.now())
+        with patch.object(views, 'MAX_TRANSCRIPTION_ROWS', 3):
+            views._prune_transcriptions()
+        self.assertEqual(VoiceTranscription.objects.count(), 3)
+
+
+class ModelCacheTestCase(TestCase):
+    """Test the Whisper model cache with model loading stubbed out"""
+
+    def setUp(self):
+        self.service = WhisperTranscriptionService()
+        self.loaded = []
+
+        def load(model_name):
+            if model_name == 'broken':
+                raise RuntimeError('download failed')
+            self.loaded.append(model_name)
+            return object()
+
+        patcher = patch.object(self.service, '_load_model', side_effect=load)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_model_loaded_once(self):
+        """Test a cached model is reused instead of loaded again"""
+        first, _ = self.service._get_model('base')
+        second, _ = self.service._get_model('base')
+        self.assertIs(first, second)
+        self.assertEqual(self.loaded, ['base'])
+
+    def test_fallback_cached_under_base(self):
+        """Test a failed load falls back to base and caches it as base"""
+        model, loaded_name = self.service._get_model('broken')
+        self.assertEqual(loaded_name, 'base')
+        self.assertEqual(list(self.service.models), ['base'])
+        self.assertIs(self.service._get_model('base')[0], model)
+        self.assertEqual(self.loaded, ['base'])
+
+    def test_least_recently_used_evicted(self):
+        """Test loading past the cap evicts the least recently used model"""
+        with patch.object(transcription_service_module, 'MAX_CACHED_MODELS', 2):
+            self.service._get_model('tiny')
+            self.service._get_model('base')
+            self.service._get_model('tiny')
+            self.service._get_model('small')
+        self.assertEqual(list(self.service.models), ['tiny', 'small'])
+
+
+class _FakeWhisperModel:
+    """Stands in for WhisperModel: transcribes anything to no segments."""
+
+    def transcribe(self, audio, **options):
+        return iter([]), SimpleNamespace(language='en')
+
+
+class ResultCacheTestCase(TestCase):
+    """Test identical re-uploads are served from the result cache"""
+
+    def setUp(self):
+        self.service = WhisperTranscriptionService()
+        self.audio = np.zeros(16000, dtype=np.float32)
+        # Silent audio takes the no-speech path, so no model is ever needed.
+        patcher = patch.object(
+            transcription_service_module, 'decode_audio', return_value=self.audio
+        )
+        self.decode_audio = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_identical_upload_reuses_result(self):
+        """Test the same bytes are decoded once, from file objects or paths"""
+        first = self.service.transcribe_audio(io.BytesIO(b'recording'))
+        second = self.service.transcribe_audio(io.BytesIO(b'recording'))
+        with tempfile.NamedTemporaryFile() as f:
+            f.write(b'recording')
+            f.flush()
+            third = self.service.transcribe_audio(f.name)
+        self.assertTrue(first['success'])
+        self.assertEqual(second['text'], first['text'])
+        self.assertEqual(third['text'], first['text'])
+        self.assertEqual(self.decode_audio.call_count, 1)
+
+    def test_file_object_rewound(self):
+        """Test hashing leaves the upload readable from the start"""
+        upload = io.BytesIO(b'recording')
+        self.service.transcribe_audio(upload)
+        self.assertEqual(self.decode_audio.call_args[0][0].read(), b'recording')
+
+    def test_options_are_part_of_key(self):
+        """Test a different model or language is transcribed again"""
+        self.service.transcribe_audio(io.BytesIO(b'recording'))
+        self.service.transcribe_audio(io.BytesIO(b'recording'), model_name='tiny')
+        self.service.transcribe_audio(io.BytesIO(b'recording'), language='en')
+        self.assertEqual(self.decode_audio.call_count, 3)
+
+    def test_fallback_result_not_cached(self):
+        """Test a result from the base fallback isn't reused for the requested model"""
+        failures = ['medium']
+
+        def load(model_name):
+            if model_name in failures:
+                failures.remove(model_name)
+                raise RuntimeError('download failed')
+            return _FakeWhisperModel()
+
+        speech = [{'start': 0, 'end': len(self.audio)}]
+        with patch.object(self.service, '_load_model', side_effect=load), \
+                patch.object(transcription_service_module, 'get_speech_timestamps',
+                             return_value=speech):
+            first = self.service.transcribe_audio(io.BytesIO(b'recording'), model_name='medium')
+            second = self.service.transcribe_audio(io.BytesIO(b'recording'), model_name='medium')
+        self.assertEqual(first['model_used'], 'base')
+        self.assertEqual(second['model_used'], 'medium')
+        self.assertEqual(self.decode_audio.call_count, 2)
+
+    def test_least_recently_used_evicted(self):
+        """Test results past the cap evict the least recently used one"""
+        with patch.object(transcription_service_module, 'MAX_CACHED_RESULTS', 2):
+            for data in (b'one', b'two', b'one', b'three'):
+                self.service.transcribe_audio(io.BytesIO(data))
+            self.assertEqual(self.decode_audio.call_count, 3)
+            self.service.transcribe_audio(io.BytesIO(b'one'))
+            self.assertEqual(self.decode_audio.call_count, 3)
+            self.service.transcribe_audio(io.BytesIO(b'two'))
+            self.assertEqual(self.decode_audio.call_count, 4)
+
+
+class DefaultModelTestCase(TestCase):
+    """Test requests without a model use the preloaded default model"""
+
+    def test_upload_defaults_to_setting(self):
+        """Test the upload serializer defaults to WHISPER_DEFAULT_MODEL"""
+        upload = SimpleUploadedFile('clip.wav', b'recording')
+        serializer = AudioUploadSerializer(data={'audio_file': upload})
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(serializer.validated_data['model'], settings.WHISPER_DEFAULT_MODEL)
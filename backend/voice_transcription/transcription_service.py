@@ -1,62 +1,187 @@
-import whisper
+import gc
+import hashlib
+import math
 import time
-import os
-import tempfile
 import logging
 import threading
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+from typing import BinaryIO, Dict, Any, Optional, Tuple, Union
 from django.conf import settings
-import torch
+import ctranslate2
+import numpy as np
+from faster_whisper import BatchedInferencePipeline, WhisperModel, decode_audio
+from faster_whisper.transcribe import restore_speech_timestamps
+from faster_whisper.vad import VadOptions, get_speech_timestamps
 
 logger = logging.getLogger(__name__)
 
+# Recordings longer than one 30s Whisper window are split into VAD chunks and
+# decoded BATCH_SIZE chunks per forward pass; shorter ones have nothing to batch.
+BATCHED_MIN_SECONDS = 30
+BATCH_SIZE = 16
+# Whisper sizes kept resident at once (tiny..medium together is ~1.5GB); the
+# least recently used one is dropped when another is loaded.
+MAX_CACHED_MODELS = 2
+# Results of recent transcriptions, keyed by a hash of the uploaded bytes, so a
+# retry of the same recording is answered without decoding it again.
+MAX_CACHED_RESULTS = 128
+# Whisper and Silero VAD both take 16 kHz mono, decode_audio's default.
+SAMPLING_RATE = 16000
+# Silero VAD settings for short recordings (WhisperModel's own defaults); the
+# batched pipeline applies its own VAD settings to long ones.
+VAD_OPTIONS = VadOptions()
+# Greedy, single-pass decoding. Voice input is short commands, where beam
+# search and temperature-fallback retries multiply decoder work for no gain,
+# and conditioning on earlier text mostly carries hallucinations forward.
+DECODE_OPTIONS = {
+    'beam_size': 1,
+    'best_of': 1,
+    'temperature': 0.0,
+    'condition_on_previous_text': False,
+    'no_speech_threshold': 0.6,
+}
+
 
 class WhisperTranscriptionService:
     """
-    Service for handling offline voice transcription using OpenAI Whisper
+    Service for handling offline voice transcription using Whisper.
+
+    Inference runs through faster-whisper (CTranslate2): the same Whisper
+    weights, converted, with fused kernels and reduced-precision compute.
     """
     
     def __init__(self):
-        self.models = {}
-        # Guards the check-and-load in _get_model so concurrent requests don't
-        # trigger duplicate (expensive) model loads or race on self.models.
+        # model_name -> WhisperModel, least recently used first.
+        self.models = OrderedDict()
+        # content digest -> successful transcription result, least recent first.
+        self.results = OrderedDict()
+        # _cache_lock guards self.models and self.results and is only held briefly;
+        # _model_lock serializes the (slow) loads so concurrent requests don't
+        # load the same model twice.
+        self._cache_lock = threading.Lock()
         self._model_lock = threading.Lock()
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        logger.info(f"Whisper service initialized on device: {self.device}")
+        self.device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+        # int8 weights everywhere (a quarter of the FP32 bytes); on CUDA the
+        # activations run in float16 on tensor cores.
+        self.compute_type = settings.WHISPER_COMPUTE_TYPE or (
+            "int8_float16" if self.device == "cuda" else "int8"
+        )
+        logger.info(
+            f"Whisper service initialized on device: {self.device} "
+            f"(compute_type={self.compute_type})"
+        )
+
+    def _load_model(self, model_name: str) -> WhisperModel:
+        return WhisperModel(model_name, device=self.device, compute_type=self.compute_type)
+
+    def _cached_model(self, model_name: str) -> Optional[WhisperModel]:
+        with self._cache_lock:
+            model = self.models.get(model_name)
+            if model is not None:
+                self.models.move_to_end(model_name)
+            return model
+
+    def _cache_model(self, model_name: str, model: WhisperModel):
+        """Cache a loaded model, evicting least recently used ones over the cap."""
+        with self._cache_lock:
+            self.models[model_name] = model
+            evicted = [
+                self.models.popitem(last=False)[0]
+                for _ in range(len(self.models) - MAX_CACHED_MODELS)
+            ]
+        if evicted:
+            # Requests still transcribing with an evicted model hold their own
+            # reference; its memory is released once the last one finishes.
+            gc.collect()
+            logger.info(f"Evicted Whisper model(s) from cache: {', '.join(evicted)}")
+
+    @staticmethod
+    def _audio_digest(audio: Union[str, BinaryIO], model_name: str,
+                      language: Optional[str]) -> str:
+        """Hash the raw audio bytes plus the options that shape the result."""
+        digest = hashlib.blake2b(f"{model_name}\0{language or ''}\0".encode(), digest_size=16)
+        if isinstance(audio, str):
+            with open(audio, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(chunk)
+        else:
+            audio.seek(0)
+            for chunk in iter(lambda: audio.read(1 << 20), b''):
+                digest.update(chunk)
+            audio.seek(0)
+        return digest.hexdigest()
 
-    def _get_model(self, model_name: str):
-        """Load and cache Whisper models (thread-safe)."""
-        # Fast path: already cached, no lock needed.
-        if model_name in self.models:
-            return self.models[model_name]
+    def _cached_result(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._cache_lock:
+            result = self.results.get(key)
+            if result is not None:
+                self.results.move_to_end(key)
+            return result
+
+    def _cache_result(self, key: str, result: Dict[str, Any]):
+        with self._cache_lock:
+            self.results[key] = result
+            while len(self.results) > MAX_CACHED_RESULTS:
+                self.results.popitem(last=False)
+
+    def _get_model(self, model_name: str) -> Tuple[WhisperModel, str]:
+        """
+        Load and cache Whisper models (thread-safe, LRU-bounded).
+
+        Returns (model, loaded_name). loaded_name is 'base' when model_name
+        failed to load and the base model was used instead.
+        """
+        model = self._cached_model(model_name)
+        if model is not None:
+            return model, model_name
 
         with self._model_lock:
             # Re-check inside the lock in case another thread loaded it while
             # we were waiting.
-            if model_name in self.models:
-                return self.models[model_name]
+            model = self._cached_model(model_name)
+            if model is not None:
+                return model, model_name
 
             logger.info(f"Loading Whisper model: {model_name}")
             try:
-                self.models[model_name] = whisper.load_model(model_name, device=self.device)
+                model = self._load_model(model_name)
                 logger.info(f"Successfully loaded {model_name} model")
             except Exception as e:
                 logger.error(f"Failed to load {model_name} model: {e}")
-                # Fallback to base model
-                if model_name != 'base':
-                    logger.info("Falling back to base model")
-                    self.models[model_name] = whisper.load_model('base', device=self.device)
-                else:
+                if model_name == 'base':
                     raise
-        return self.models[model_name]
+                # Fall back to base, cached under its own name so a later
+                # successful load of model_name isn't shadowed by it.
+                logger.info("Falling back to base model")
+                model_name = 'base'
+                model = self._cached_model(model_name)
+                if model is None:
+                    model = self._load_model(model_name)
+            self._cache_model(model_name, model)
+        return model, model_name
     
-    def transcribe_audio(self, audio_file_path: str, model_name: str = 'base', 
+    def preload(self, model_name: str):
+        """
+        Load a model and run one throwaway decode so the first real request
+        hits warm weights. Best-effort: failures are logged, never raised.
+        """
+        try:
+            start_time = time.time()
+            model, model_name = self._get_model(model_name)
+            silence = np.zeros(model.feature_extractor.sampling_rate, dtype=np.float32)
+            segments, _ = model.transcribe(silence)
+            list(segments)
+            logger.info(f"Preloaded Whisper {model_name} model in {time.time() - start_time:.2f}s")
+        except Exception as e:
+            logger.warning(f"Failed to preload Whisper {model_name} model: {e}")
+
+    def transcribe_audio(self, audio: Union[str, BinaryIO], model_name: str = 'base', 
                         language: Optional[str] = None) -> Dict[str, Any]:
         """
-        Transcribe audio file using Whisper
+        Transcribe audio using Whisper
         
         Args:
-            audio_file_path: Path to audio file
+            audio: Path to an audio file, or a readable binary file object
             model_name: Whisper model to use ('tiny', 'base', 'small', 'medium')
             language: Language code (e.g., 'en', 'es', 'fr') or None for auto-detect
             
@@ -66,17 +191,65 @@ class WhisperTranscriptionService:
         start_time = time.time()
         
         try:
-            # Load the model
-            model = self._get_model(model_name)
-            
-            # Transcribe
-            logger.info(f"Starting transcription of {audio_file_path} with {model_name} model")
-            
-            transcribe_options = {}
-            if language:
-                transcribe_options['language'] = language
-                
-            result = model.transcribe(audio_file_path, **transcribe_options)
+            # Identical re-uploads (a user hitting retry) reuse the earlier result.
+            requested_model = model_name
+            key = self._audio_digest(audio, requested_model, language)
+            cached = self._cached_result(key)
+            if cached is not None:
+                logger.info("Audio matches a recent transcription; reusing its result")
+                return {**cached, 'processing_time': time.time() - start_time}
+
+            logger.info(f"Starting transcription of {getattr(audio, 'name', audio)} with {model_name} model")
+            audio = decode_audio(audio, sampling_rate=SAMPLING_RATE)
+            long_audio = len(audio) / SAMPLING_RATE > BATCHED_MIN_SECONDS
+
+            # Short recordings run Silero VAD here, once (milliseconds on the
+            # CPU): its speech spans both gate Whisper, so a recording with no
+            # speech (an accidental mic press) never reaches it, and become
+            # Whisper's input. Long recordings go to the batched pipeline, which
+            # runs VAD itself to cut them into chunks.
+            speech_chunks = None if long_audio else get_speech_timestamps(audio, VAD_OPTIONS)
+            if speech_chunks == []:
+                logger.info("No speech detected; skipping Whisper")
+                segments, detected_language = [], language or 'unknown'
+            else:
+                # Load the model (model_name becomes 'base' if it had to fall back)
+                model, model_name = self._get_model(model_name)
+
+                transcribe_options = dict(DECODE_OPTIONS)
+                if language:
+                    transcribe_options['language'] = language
+
+                if long_audio:
+                    # The pipeline carries per-call state, so build one per request;
+                    # it only wraps the cached model and is cheap to construct.
+                    batched = BatchedInferencePipeline(model=model)
+                    segments, info = batched.transcribe(
+                        audio, batch_size=BATCH_SIZE, **transcribe_options
+                    )
+                else:
+                    # Decode only the speech, then map segment times back onto
+                    # the original recording.
+                    speech = np.concatenate([audio[c['start']:c['end']] for c in speech_chunks])
+                    segments, info = model.transcribe(speech, **transcribe_options)
+                    segments = restore_speech_timestamps(segments, speech_chunks, SAMPLING_RATE)
+                detected_language = info.language
+                # faster-whisper decodes lazily; draining the generator runs the model.
+                segments = [
+                    {
+                        'start': seg.start,
+                        'end': seg.end,
+                        'text': seg.text,
+                        'avg_logprob': seg.avg_logprob,
+                        'no_speech_prob': seg.no_speech_prob,
+                    }
+                    for seg in segments
+                ]
+            result = {
+                'text': ''.join(seg['text'] for seg in segments),
+                'language': detected_language,
+                'segments': segments,
+            }
             
             processing_time = time.time() - start_time
             
@@ -90,6 +263,10 @@ class WhisperTranscriptionService:
                 'success': True
             }
             
+            # A fallback result is not what requested_model would produce; keep it
+            # out of the cache so a retry loads requested_model once it's back.
+            if model_name == requested_model:
+                self._cache_result(key, transcription_result)
             logger.info(f"Transcription completed in {processing_time:.2f}s: {transcription_result['text'][:100]}...")
             return transcription_result
             
@@ -113,48 +290,50 @@ class WhisperTranscriptionService:
             if not segments:
                 return 0.0
                 
-            total_confidence = 0.0
-            total_duration = 0.0
-            
-            for segment in segments:
-                # Whisper doesn't provide confidence directly, 
-                # but we can estimate from no_speech_prob
-                no_speech_prob = segment.get('no_speech_prob', 0.5)
-                confidence = 1.0 - no_speech_prob
-                duration = segment.get('end', 0) - segment.get('start', 0)
-                
-                total_confidence += confidence * duration
-                total_duration += duration
+            # Whisper doesn't provide confidence directly; estimate it per
+            # segment from the decoder's mean token probability, discounted by
+            # how likely the segment is to be non-speech, then take the
+            # duration-weighted mean over all segments in one vector pass.
+            stats = np.array(
+                [
+                    (
+                        segment.get('avg_logprob', math.log(0.5)),
+                        segment.get('no_speech_prob', 0.5),
+                        segment.get('end', 0) - segment.get('start', 0),
+                    )
+                    for segment in segments
+                ],
+                dtype=np.float64,
+            )
+            avg_logprob, no_speech_prob, duration = stats.T
+            confidence = np.exp(avg_logprob) * (1.0 - no_speech_prob)
+            total_duration = duration.sum()
             
-            return total_confidence / total_duration if total_duration > 0 else 0.0
+            return float(confidence @ duration / total_duration) if total_duration > 0 else 0.0
             
         except Exception as e:
             logger.warning(f"Failed to calculate confidence: {e}")
             return 0.0
-    
-    def save_temp_audio_file(self, audio_data: bytes, suffix: str = '.wav') -> str:
-        """
-        Save audio data to temporary file
-        
-        Returns:
-            Path to temporary file
-        """
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
-        temp_file.write(audio_data)
-        temp_file.close()
-        return temp_file.name
-    
-    def cleanup_temp_file(self, file_path: str):
-        """
-        Clean up temporary file
-        """
-        try:
-            if os.path.exists(file_path):
-                os.unlink(file_path)
-                logger.debug(f"Cleaned up temp file: {file_path}")
-        except Exception as e:
-            logger.warning(f"Failed to cleanup temp file {file_path}: {e}")
 
 
 # Global service instance
-transcription_service = WhisperTranscriptionService()
\ No newline at end of file
+transcription_service = WhisperTranscriptionService()
+
+
+def preload_default_model():
+    """
+    Warm settings.WHISPER_DEFAULT_MODEL on a background thread.
+
+    Called from the ASGI/WSGI entrypoints, which only serving processes import,
+    so migrate and other management commands never pay for a model load. The
+    thread lets the server start accepting requests immediately; a request that
+    arrives mid-load simply waits on the model lock.
+    """
+    if not settings.WHISPER_PRELOAD:
+        return
+    threading.Thread(
+        target=transcription_service.preload,
+        args=(settings.WHISPER_DEFAULT_MODEL,),
+        name='whisper-preload',
+        daemon=True,
+    ).start()
\ No newline at end of file
@@ -2,6 +2,8 @@ from rest_framework import status
 from rest_framework.decorators import api_view, parser_classes
 from rest_framework.parsers import MultiPartParser, FileUploadParser
 from rest_framework.response import Response
+from django.conf import settings
+from django.db.models import Q
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
@@ -25,15 +27,24 @@ MAX_TRANSCRIPTION_ROWS = 500
 def _prune_transcriptions():
     """Delete transcription rows beyond the newest MAX_TRANSCRIPTION_ROWS.
 
-    The model orders by -created_at, so the kept set is the first N pks. Any row
-    not in that set is deleted. Best-effort: failures here must not break the
-    transcription response.
+    Rows are ranked newest first by (created_at, id), with id breaking ties
+    between equal timestamps. The first row past the cap marks the cutoff: it
+    and everything ranked after it is deleted. Under the cap that lookup comes
+    back empty and no DELETE is issued. Best-effort: failures here must not
+    break the transcription response.
     """
     try:
-        keep_ids = list(
-            VoiceTranscription.objects.values_list('id', flat=True)[:MAX_TRANSCRIPTION_ROWS]
+        cutoff = list(
+            VoiceTranscription.objects.order_by('-created_at', '-id').values_list(
+                'created_at', 'id'
+            )[MAX_TRANSCRIPTION_ROWS:MAX_TRANSCRIPTION_ROWS + 1]
         )
-        deleted, _ = VoiceTranscription.objects.exclude(id__in=keep_ids).delete()
+        if not cutoff:
+            return
+        created_at, pk = cutoff[0]
+        deleted, _ = VoiceTranscription.objects.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lte=pk)
+        ).delete()
         if deleted:
             logger.info(f"Pruned {deleted} old transcription rows (cap={MAX_TRANSCRIPTION_ROWS})")
     except Exception as e:
@@ -56,10 +67,10 @@ def transcribe_audio(request):
             }, status=status.HTTP_400_BAD_REQUEST)
 
         audio_file = serializer.validated_data['audio_file']
-        model_name = serializer.validated_data.get('model', 'base')
+        model_name = serializer.validated_data.get('model', settings.WHISPER_DEFAULT_MODEL)
         language = serializer.validated_data.get('language')
 
-        # Reject oversized uploads before reading them into memory.
+        # Reject oversized uploads before decoding them.
         if audio_file.size is not None and audio_file.size > MAX_AUDIO_UPLOAD_BYTES:
             return Response({
                 'success': False,
@@ -69,61 +80,52 @@ def transcribe_audio(request):
                 )
             }, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
         
-        # Save uploaded file temporarily
-        temp_file_path = None
-        try:
-            # Read audio data
-            audio_data = audio_file.read()
-            
-            # Save to temporary file
-            temp_file_path = transcription_service.save_temp_audio_file(
-                audio_data, 
-                suffix=f'.{audio_file.name.split(".")[-1]}'
-            )
-            
-            # Transcribe
-            result = transcription_service.transcribe_audio(
-                temp_file_path, 
-                model_name=model_name,
-                language=language
+        # Decode straight from the upload: Django has already spooled large
+        # uploads to disk and holds small ones in memory, so copying either
+        # into another temp file would only add a write and a read.
+        if hasattr(audio_file, 'temporary_file_path'):
+            audio_source = audio_file.temporary_file_path()
+        else:
+            audio_source = audio_file
+
+        # Transcribe
+        result = transcription_service.transcribe_audio(
+            audio_source,
+            model_name=model_name,
+            language=language
+        )
+        
+        if result['success']:
+            # Save to database
+            transcription = VoiceTranscription.objects.create(
+                audio_filename=audio_file.name,
+                transcription_text=result['text'],
+                confidence_score=result.get('confidence', 0.0),
+                model_used=result['model_used'],
+                processing_time=result['processing_time']
             )
-            
-            if result['success']:
-                # Save to database
-                transcription = VoiceTranscription.objects.create(
-                    audio_filename=audio_file.name,
-                    transcription_text=result['text'],
-                    confidence_score=result.get('confidence', 0.0),
-                    model_used=result['model_used'],
-                    processing_time=result['processing_time']
-                )
 
-                # Cap table growth: keep only the newest MAX_TRANSCRIPTION_ROWS.
-                _prune_transcriptions()
-
-                response_data = {
-                    'success': True,
-                    'transcription_id': str(transcription.id),
-                    'text': result['text'],
-                    'confidence': result.get('confidence', 0.0),
-                    'language': result.get('language', 'unknown'),
-                    'model_used': result['model_used'],
-                    'processing_time': result['processing_time']
-                }
-                
-                logger.info(f"Successful transcription: {result['text'][:100]}...")
-                return Response(response_data, status=status.HTTP_200_OK)
-            else:
-                return Response({
-                    'success': False,
-                    'error': result.get('error', 'Transcription failed'),
-                    'processing_time': result['processing_time']
-                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-                
-        finally:
-            # Cleanup temporary file
-            if temp_file_path:
-                transcription_service.cleanup_temp_file(temp_file_path)
+            # Cap table growth: keep only the newest MAX_TRANSCRIPTION_ROWS.
+            _prune_transcriptions()
+
+            response_data = {
+                'success': True,
+                'transcription_id': str(transcription.id),
+                'text': result['text'],
+                'confidence': result.get('confidence', 0.0),
+                'language': result.get('language', 'unknown'),
+                'model_used': result['model_used'],
+                'processing_time': result['processing_time']
+            }
+            
+            logger.info(f"Successful transcription: {result['text'][:100]}...")
+            return Response(response_data, status=status.HTTP_200_OK)
+        else:
+            return Response({
+                'success': False,
+                'error': result.get('error', 'Transcription failed'),
+                'processing_time': result['processing_time']
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
                 
     except Exception as e:
         logger.error(f"Transcription endpoint error: {e}")
@@ -140,15 +142,14 @@ def health_check(request):
     Health check endpoint for voice transcription service
     """
     try:
-        # Test if Whisper can be loaded
-        test_model = transcription_service._get_model('base')
-        
+        # Report load state only; models are preloaded at server start, so the
+        # health check never blocks on (or triggers) a model load.
         return Response({
             'success': True,
             'status': 'Voice transcription service is running',
             'available_models': ['tiny', 'base', 'small', 'medium'],
             'device': transcription_service.device,
-            'whisper_loaded': test_model is not None
+            'whisper_loaded': bool(transcription_service.models)
         }, status=status.HTTP_200_OK)
         
     except Exception as e:
@@ -166,7 +167,11 @@ def list_transcriptions(request):
     List recent transcriptions
     """
     try:
-        transcriptions = VoiceTranscription.objects.all()[:20]  # Last 20
+        # Last 20, selecting only the serialized columns (skips audio_filename);
+        # the created_at index serves the ORDER BY ... LIMIT.
+        transcriptions = VoiceTranscription.objects.only(
+            *VoiceTranscriptionSerializer.Meta.fields
+        )[:20]
         serializer = VoiceTranscriptionSerializer(transcriptions, many=True)
         return Response({
             'success': True,
@@ -187,8 +192,9 @@ def clear_transcriptions(request):
     Clear all transcription history
     """
     try:
-        count = VoiceTranscription.objects.all().count()
-        VoiceTranscription.objects.all().delete()
+        # One DELETE; the model has no relations or signals, so Django
+        # fast-deletes without fetching rows and reports the count itself.
+        count, _ = VoiceTranscription.objects.all().delete()
         
         return Response({
             'success': True,
@@ -9,13 +9,15 @@ This adds "Test Message" to the message queue for Terminal 3.
 """
 
 import sys
-import subprocess
 import os
 
 def main():
-    # Change to backend directory
-    backend_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend')
+    # Run Django in this process: put the backend on the path and boot once,
+    # instead of spawning a second interpreter for backend/manage.py.
+    backend_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
     os.chdir(backend_dir)
+    sys.path.insert(0, backend_dir)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'terminal_backend.settings')
     
     if len(sys.argv) < 2:
         print("Usage: python manage.py addMessage <message> [terminal_number]")
@@ -27,22 +29,15 @@ def main():
         terminal = sys.argv[3] if len(sys.argv) > 3 else None
         
         # Build the Django management command
-        cmd = ["python", "manage.py", "add_message", message]
+        argv = ["manage.py", "add_message", message]
         if terminal:
-            cmd.extend(["--terminal", terminal])
-        
-        # Execute the command
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.stdout:
-            print(result.stdout.strip())
-        if result.stderr:
-            print(result.stderr.strip(), file=sys.stderr)
-        sys.exit(result.returncode)
+            argv.extend(["--terminal", terminal])
     else:
         # Pass through to Django's manage.py for other commands
-        cmd = ["python", "manage.py"] + sys.argv[1:]
-        result = subprocess.run(cmd)
-        sys.exit(result.returncode)
+        argv = ["manage.py"] + sys.argv[1:]
+
+    from django.core.management import execute_from_command_line
+    execute_from_command_line(argv)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file